@@ -1,12 +1,146 @@
 import logging
-import json
+import os
+import pickle
+import time
+from collections.abc import Iterable
+from itertools import chain
 import pyarrow as pa
 import polars as pl
-from deltalake import write_deltalake, DeltaTable
+from deltalake import write_deltalake, DeltaTable, WriterProperties, ColumnProperties
+from deltalake.exceptions import TableNotFoundError
 
 
 logger = logging.getLogger(__name__)
 
+# Cheap ZSTD and larger data pages give fewer, larger Parquet parts per commit.
+# Statistics are kept per column chunk only, computed inline by the encoder.
+DEFAULT_WRITER_PROPERTIES = WriterProperties(
+    compression="ZSTD",
+    compression_level=1,
+    data_page_size_limit=1024 * 1024,
+    default_column_properties=ColumnProperties(statistics_enabled="CHUNK")
+)
+
+# Only collect data skipping statistics for the first columns of new tables
+DEFAULT_TABLE_CONFIGURATION = {"delta.dataSkippingNumIndexedCols": "8"}
+
+# Directory backing POSIX shared memory, used to hand tables to local processes
+SHM_DIR = "/dev/shm"
+
+# Delta tables only disappear when explicitly dropped, so existing tables are
+# remembered for good while missing ones are re-checked after a short delay
+MISSING_DELTATABLE_TTL_SECONDS = 30.0
+_existing_deltatables: set[tuple] = set()
+_missing_deltatables: dict[tuple, float] = {}
+
+# Open Delta table handles, keyed by (path, storage options), oldest first
+DELTA_TABLE_CACHE_SIZE = 128
+_delta_tables: dict[tuple, DeltaTable] = {}
+
+# Errors raised when a cached handle points at files of a dropped or recreated table
+_STALE_TABLE_ERRORS = (FileNotFoundError, TableNotFoundError)
+
+
+def _storage_options_key(storage_options: dict = None) -> tuple:
+    """
+    Builds a hashable cache key from storage options.
+    """
+    return tuple(sorted((storage_options or {}).items()))
+
+
+def _get_delta_table(
+    path: str,
+    storage_options_key: tuple
+) -> DeltaTable:
+    """
+    Opens a Delta table once per (path, storage options) and caches the handle.
+    """
+    key = (path, storage_options_key)
+    delta_table = _delta_tables.get(key)
+    if delta_table is None:
+        logger.debug("Opening Delta table handle for path: %s", path)
+        delta_table = DeltaTable(path, storage_options=dict(storage_options_key) or None)
+        if len(_delta_tables) >= DELTA_TABLE_CACHE_SIZE:
+            # Drop the oldest handle to bound the cache
+            _delta_tables.pop(next(iter(_delta_tables)), None)
+        _delta_tables[key] = delta_table
+    return delta_table
+
+
+def _evict_delta_table(
+    path: str,
+    storage_options: dict = None
+) -> None:
+    """
+    Drops the cached Delta table handle so the next use reopens the table.
+    """
+    _delta_tables.pop((path, _storage_options_key(storage_options)), None)
+
+
+def _load_delta_table(
+    path: str,
+    storage_options: dict = None
+) -> DeltaTable:
+    """
+    Returns the cached Delta table handle, refreshed with any new commits.
+    """
+    delta_table = _get_delta_table(path, _storage_options_key(storage_options))
+    try:
+        delta_table.update_incremental()
+    except _STALE_TABLE_ERRORS as e:
+        # The log under the cached handle is gone, reopen the table from scratch
+        logger.warning("Reopening stale Delta table handle for path '%s': %s", path, e)
+        _evict_delta_table(path, storage_options)
+        delta_table = _get_delta_table(path, _storage_options_key(storage_options))
+    return delta_table
+
+
+def _is_deltatable(
+    path: str,
+    storage_options: dict = None
+) -> bool:
+    """
+    Checks if a location contains a Delta table, using the existence caches.
+    """
+    key = (path, _storage_options_key(storage_options))
+    if key in _existing_deltatables:
+        return True
+    checked_at = _missing_deltatables.get(key)
+    if checked_at is not None and time.monotonic() - checked_at < MISSING_DELTATABLE_TTL_SECONDS:
+        return False
+
+    is_deltatable = DeltaTable.is_deltatable(
+        table_uri=path,
+        storage_options=storage_options
+    )
+    if is_deltatable:
+        _existing_deltatables.add(key)
+        _missing_deltatables.pop(key, None)
+        # Seed the handle cache so a follow-up read does not reload the log
+        _get_delta_table(*key)
+    else:
+        _missing_deltatables[key] = time.monotonic()
+    return is_deltatable
+
+
+def invalidate_deltatable_cache(path: str) -> None:
+    """
+    Forgets the cached existence checks and handles of a Delta table.
+
+    Call it after creating or dropping the table at `path` outside of this module
+    so that `check_if_deltatable` does not return a stale answer.
+
+    Parameters:
+        path (str): Path of the Delta table in the Delta Lake.
+    """
+    for key in [key for key in _missing_deltatables if key[0] == path]:
+        del _missing_deltatables[key]
+    _existing_deltatables.difference_update([key for key in _existing_deltatables if key[0] == path])
+
+    # Handles may have been opened by reads or upserts without an existence check
+    for key in [key for key in _delta_tables if key[0] == path]:
+        del _delta_tables[key]
+
 
 def check_if_deltatable(
     path: str,
@@ -25,25 +159,69 @@ def check_if_deltatable(
     Raises:
         exception: If there is an error during the check.
     """
-    logger.info(f"Checking if a Delta table exists at the specified path: {path}")
+    return DeltaHandle(path, storage_options).exists()
 
-    try:
-        # Check if the location is a Delta table
-        is_deltatable = DeltaTable.is_deltatable(
-            table_uri=path,
-            storage_options=storage_options
-        )
-        # Log the result
-        if is_deltatable:
-            logger.info(f"The path '{path}' contains a valid Delta table.")
-        else:
-            logger.warning(f"The path '{path}' does not contain a Delta table or it does not exist.")
-        return is_deltatable
 
-    except Exception as e:
-        logger.error(f"An error occurred while checking if the path '{path}' is a Delta table: {e}")
-        raise
 
+def _polars_to_arrow(df: pl.DataFrame) -> pa.Table:
+    """
+    Exports a Polars DataFrame to Arrow in a layout the deltalake writer accepts.
+
+    Categorical and Enum types, including those nested in lists and structs, are cast to
+    strings first: at the newest compat level they become `dictionary<string_view>`, which
+    the deltalake Parquet writer cannot encode.
+    """
+    casts = {}
+    for name, dtype in df.schema.items():
+        string_dtype = _without_dictionary_types(dtype)
+        if string_dtype != dtype:
+            casts[name] = string_dtype
+    if casts:
+        df = df.with_columns(pl.col(name).cast(dtype) for name, dtype in casts.items())
+    return df.to_arrow(compat_level=pl.CompatLevel.newest())
+
+
+def _without_dictionary_types(dtype: pl.DataType) -> pl.DataType:
+    """
+    Replaces Categorical and Enum types with String, recursing into nested types.
+    """
+    if isinstance(dtype, (pl.Categorical, pl.Enum)):
+        return pl.String()
+    if isinstance(dtype, pl.List):
+        return pl.List(_without_dictionary_types(dtype.inner))
+    if isinstance(dtype, pl.Array):
+        return pl.Array(_without_dictionary_types(dtype.inner), dtype.shape)
+    if isinstance(dtype, pl.Struct):
+        return pl.Struct([pl.Field(field.name, _without_dictionary_types(field.dtype)) for field in dtype.fields])
+    return dtype
+
+
+def _to_record_batch_reader(
+    table,
+    batch_size: int
+) -> pa.RecordBatchReader:
+    """
+    Wraps a supported table type in a RecordBatchReader of at most `batch_size` rows per batch.
+    """
+    if isinstance(table, pa.RecordBatchReader):
+        return table
+    if isinstance(table, pa.Table):
+        return table.to_reader(max_chunksize=batch_size)
+    if isinstance(table, pl.DataFrame):
+        schema = _polars_to_arrow(table.head(0)).schema
+        batches = (
+            batch
+            for frame in table.iter_slices(n_rows=batch_size)
+            for batch in _polars_to_arrow(frame).to_batches()
+        )
+        return pa.RecordBatchReader.from_batches(schema, batches)
+    if isinstance(table, Iterable):
+        batches = iter(table)
+        first_batch = next(batches, None)
+        if isinstance(first_batch, pa.RecordBatch):
+            return pa.RecordBatchReader.from_batches(first_batch.schema, chain([first_batch], batches))
+
+    raise ValueError("Input table must be an Arrow Table, a Polars DataFrame or a stream of Arrow RecordBatches.")
 
 
 def write_table_to_deltalake(
@@ -51,53 +229,100 @@ def write_table_to_deltalake(
     path: str,
     storage_options = None,
     partition_by = None,
-    mode  = "overwrite"
+    mode  = "overwrite",
+    writer_properties: WriterProperties = DEFAULT_WRITER_PROPERTIES,
+    batch_size: int = 64_000,
+    configuration: dict = None
 ):
     """
     Writes a table to a Delta Lake.
 
     Parameters:
-        table (Union[pa.Table, pl.DataFrame]): The table to write, either as an Arrow Table or a Polars DataFrame.
+        table (Union[pa.Table, pl.DataFrame, pa.RecordBatchReader, Iterable[pa.RecordBatch]]): The table to write,
+            either as an Arrow Table, a Polars DataFrame, a RecordBatchReader or an iterable of RecordBatches.
         path (str): Path where the Delta table will be written.
         storage_options (dict, optional): Storage options (e.g., authentication credentials). Defaults to None.
+        partition_by (list, optional): Column names to partition the Delta table by. Defaults to None.
         mode (str, optional): Write mode, e.g., "overwrite" or "append". Defaults to "overwrite".
+        writer_properties (WriterProperties, optional): Parquet writer properties. Defaults to ZSTD level 1 with 1 MiB data pages and chunk-level statistics.
+        batch_size (int, optional): Maximum number of rows per record batch handed to the writer. Defaults to 64000.
+        configuration (dict, optional): Delta table properties set when the table is created.
+            Defaults to indexing statistics for the first 8 columns only.
 
     Raises:
         ValueError: If the input table is not a supported type.
         Exception: If there is an error during the write operation.
     """
     try:
-        logger.info(f"Writing Delta table to: {path} with mode: {mode}")
-
-        # Convert Polars DataFrame to Arrow Table if necessary
-        if isinstance(table, pl.DataFrame):
-            logger.debug("Converting Polars DataFrame to Arrow Table.")
-            table = table.to_arrow()
-        elif not isinstance(table, pa.Table):
-            raise ValueError("Input table must be an Arrow Table or a Polars DataFrame.")
+        logger.info("Writing Delta table to: %s with mode: %s", path, mode)
 
-        # Write the table to Delta Lake
+        # Feed the writer a stream of batches so the Rust engine consumes them lazily
+        reader = _to_record_batch_reader(table, batch_size)
+        if configuration is None:
+            configuration = DEFAULT_TABLE_CONFIGURATION
         write_deltalake(
             path,
-            table,
+            reader,
             mode = mode,
             storage_options = storage_options,
-            partition_by = partition_by
+            partition_by = partition_by,
+            writer_properties = writer_properties,
+            configuration = configuration
         )
+
+        # The table exists now, drop any cached negative existence check
+        _missing_deltatables.pop((path, _storage_options_key(storage_options)), None)
         logger.info("Delta table write successful.")
 
     except ValueError as ve:
-        logger.error(f"Invalid input table: {ve}")
+        logger.error("Invalid input table: %s", ve)
         raise
     except Exception as e:
-        logger.error(f"Error writing Delta table to path '{path}': {e}")
+        logger.error("Error writing Delta table to path '%s': %s", path, e)
         raise
 
 
+def _scan_delta_table(
+    delta_table: DeltaTable,
+    batch_size: int,
+    columns: list[str] | None,
+    partitions: list[tuple] | None,
+    filters
+) -> pa.RecordBatchReader:
+    """
+    Opens a RecordBatchReader over a Delta table with columns and filters pushed down.
+    """
+    if partitions:
+        # Listing the selected files is only worth it when the message is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Partition filters select %d file(s).", len(delta_table.file_uris(partition_filters=partitions)))
+
+    # Push column selection and filters down so pruned data is never loaded,
+    # and read ahead across files so several Parquet files decode in parallel
+    return (
+        delta_table
+        .to_pyarrow_dataset(partitions=partitions)
+        .scanner(
+            columns=columns,
+            filter=filters,
+            batch_size=batch_size,
+            batch_readahead=32,
+            fragment_readahead=16,
+            use_threads=True
+        )
+        .to_reader()
+    )
+
+
 def read_table_in_deltalake(
     path: str,
     storage_options: dict = None,
-    to_polars: bool = False
+    to_polars: bool = False,
+    batch_size: int = 131_072,
+    columns: list[str] | None = None,
+    partitions: list[tuple] | None = None,
+    filters = None,
+    rechunk: bool = False
 ):
     """
     Reads a Delta Lake table into an Arrow Table or a Polars DataFrame.
@@ -106,6 +331,11 @@ def read_table_in_deltalake(
         path (str): Path of the Delta table in the Delta Lake.
         storage_options (dict, optional): Storage options (e.g., authentication credentials).
         to_polars (bool, optional): If True, converts the table to a Polars DataFrame. Defaults to False.
+        batch_size (int, optional): Maximum number of rows per record batch streamed from the table. Defaults to 131072.
+        columns (list[str], optional): Columns to read. Defaults to None (all columns).
+        partitions (list[tuple], optional): Partition filters, e.g. [("year", "=", "2024")], used to prune files. Defaults to None.
+        filters (pyarrow.compute.Expression, optional): Row filter pushed down to the Parquet scan. Defaults to None.
+        rechunk (bool, optional): If True, combines the streamed batches into contiguous columns. Defaults to False.
 
     Returns:
         Union[pa.Table, pl.DataFrame]: Arrow Table or Polars DataFrame containing the data from the Delta table.
@@ -113,28 +343,116 @@ def read_table_in_deltalake(
     Raises:
         Exception: If there is an error while reading the Delta table.
     """
-    logger.info(f"Reading Delta table from path: {path}")
+    return DeltaHandle(path, storage_options).read(
+        to_polars=to_polars,
+        batch_size=batch_size,
+        columns=columns,
+        partitions=partitions,
+        filters=filters,
+        rechunk=rechunk
+    )
+
+
+def read_table_in_deltalake_to_shm(
+    path: str,
+    shm_name: str,
+    storage_options: dict = None,
+    batch_size: int = 131_072,
+    columns: list[str] | None = None,
+    partitions: list[tuple] | None = None,
+    filters = None
+) -> str:
+    """
+    Reads a Delta Lake table into an Arrow IPC stream in shared memory.
+
+    Processes on the same host can then map it with `read_table_from_shm` without copying the data.
+    The caller is responsible for removing the file once all consumers are done.
 
+    Parameters:
+        path (str): Path of the Delta table in the Delta Lake.
+        shm_name (str): Name of the shared memory file created under /dev/shm.
+        storage_options (dict, optional): Storage options (e.g., authentication credentials).
+        batch_size (int, optional): Maximum number of rows per record batch streamed from the table. Defaults to 131072.
+        columns (list[str], optional): Columns to read. Defaults to None (all columns).
+        partitions (list[tuple], optional): Partition filters, e.g. [("year", "=", "2024")], used to prune files. Defaults to None.
+        filters (pyarrow.compute.Expression, optional): Row filter pushed down to the Parquet scan. Defaults to None.
+
+    Returns:
+        str: Path of the shared memory file holding the Arrow IPC stream.
+
+    Raises:
+        ValueError: If the shared memory name is not a plain file name.
+        Exception: If there is an error while reading the Delta table or writing the stream.
+            The partially written stream is removed and any stream published earlier under
+            `shm_name` is left in place.
+    """
+    logger.info("Reading Delta table from path: %s into shared memory: %s", path, shm_name)
+
+    temp_path = None
     try:
-        # Load the Delta table
-        delta_table = DeltaTable(path, storage_options=storage_options)
-        arrow_table = delta_table.to_pyarrow_table()
+        shm_path = _shm_path(shm_name)
+        # Write under a private name and publish it at the end, so consumers never see a
+        # partial stream and a failed call never touches a stream published earlier
+        temp_path = f"{shm_path}.{os.getpid()}.tmp"
+
+        def write_stream(dt: DeltaTable) -> None:
+            reader = _scan_delta_table(dt, batch_size, columns, partitions, filters)
 
-        # Convert to Polars DataFrame if requested
-        if to_polars:
-            result = pl.from_arrow(arrow_table)
-            logger.info("Delta table successfully converted to Polars DataFrame.")
-        else:
-            result = arrow_table
-            logger.info("Delta table successfully read as Arrow Table.")
+            # Write batches as they are scanned so the table is never held in memory twice
+            with pa.OSFile(temp_path, "wb") as sink:
+                with pa.ipc.new_stream(sink, reader.schema) as writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
 
-        return result
+        DeltaHandle(path, storage_options)._with_table(write_stream)
+        os.replace(temp_path, shm_path)
+
+        logger.info("Delta table successfully written to shared memory: %s", shm_path)
+        return shm_path
 
     except Exception as e:
-        logger.error(f"Error reading Delta table from path '{path}': {e}")
+        logger.error("Error reading Delta table from path '%s' into shared memory: %s", path, e)
+        # Do not leave a truncated stream behind in RAM-backed shared memory
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
         raise
 
 
+def read_table_from_shm(
+    shm_name: str
+) -> pa.Table:
+    """
+    Maps an Arrow IPC stream written by `read_table_in_deltalake_to_shm` as an Arrow Table.
+
+    The table buffers point into the memory mapping, so no data is copied.
+
+    Parameters:
+        shm_name (str): Name of the shared memory file under /dev/shm.
+
+    Returns:
+        pa.Table: Arrow Table backed by the shared memory mapping.
+
+    Raises:
+        ValueError: If the shared memory name is not a plain file name.
+        Exception: If there is an error while mapping the stream.
+    """
+    try:
+        source = pa.memory_map(_shm_path(shm_name), "r")
+        return pa.ipc.open_stream(source).read_all()
+    except Exception as e:
+        logger.error("Error reading Arrow table from shared memory '%s': %s", shm_name, e)
+        raise
+
+
+def _shm_path(shm_name: str) -> str:
+    """
+    Resolves a shared memory name to its file under /dev/shm.
+    """
+    if not shm_name or os.sep in shm_name or shm_name in (".", ".."):
+        raise ValueError(f"Invalid shared memory name: '{shm_name}'")
+    return os.path.join(SHM_DIR, shm_name)
+
+
 def read_deltalake_metadata(
     path: str,
     storage_options: dict = None
@@ -147,29 +465,64 @@ def read_deltalake_metadata(
         storage_options (dict, optional): Storage options (e.g., authentication credentials).
 
     Returns:
-        dict: A dictionary containing the metadata, schema (in JSON format), and version of the Delta table.
+        dict: A dictionary containing the metadata, schema (as a pyarrow Schema), and version of the Delta table.
 
     Raises:
         Exception: If there is an error while reading the Delta table metadata.
     """
-    try:
-        dt = DeltaTable(path, storage_options=storage_options)
-        logger.info(f"Loaded Delta table at version {dt.version()}")
-        return {
-            "metadata": dt.metadata(),
-            "schema": json.loads(dt.schema().to_json()),
-            "version": dt.version()
-        }
-    except Exception as e:
-        logger.error(f"Error reading Delta table metadata: {e}")
-        raise
+    return DeltaHandle(path, storage_options).metadata()
+
+
+def _quote_sql_literal(value) -> str:
+    """
+    Renders a Python value as a SQL literal for a merge predicate.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _merge_changes(
+    dt: DeltaTable,
+    df_with_changes: pl.DataFrame,
+    predicate: str,
+    delete_unmatched: bool,
+    writer_properties: WriterProperties,
+    delete_predicate: str | None = None
+) -> None:
+    """
+    Runs a single update/insert(/delete) merge of the changes into the Delta table.
+    """
+    merger = (
+        dt.merge(
+            source=_polars_to_arrow(df_with_changes),
+            predicate=predicate,
+            source_alias='source',
+            target_alias='target',
+            writer_properties=writer_properties,
+            streamed_exec=False
+        )
+        .when_matched_update_all()  # Update matched rows
+        .when_not_matched_insert_all()  # Insert unmatched rows
+    )
+    # Deleting by source forces a scan of every target file, so only do it when asked
+    if delete_unmatched:
+        merger = merger.when_not_matched_by_source_delete(predicate=delete_predicate)
+    merger.execute()  # Execute the operation
 
 
 def upsert_delta_table(
     df_with_changes: pl.DataFrame,
     path: str,
     id_column: str,
-    storage_options: dict = None
+    storage_options: dict = None,
+    delete_unmatched: bool = True,
+    partition_columns: list[str] | None = None,
+    writer_properties: WriterProperties = DEFAULT_WRITER_PROPERTIES
 ) -> None:
     """
     Upserts (merges) changes into an existing Delta table in the delta lake.¨
@@ -179,34 +532,360 @@ def upsert_delta_table(
         id_column (str): The column name used as the unique identifier for the merge operation.
         logger (logging.Logger): Logger for logging messages.
         storage_options (dict, optional): Storage options (e.g., authentication credentials).
+        delete_unmatched (bool, optional): If True, rows of the target that are not in the changes are deleted.
+            If False, only update and insert are performed, which lets delta-rs skip target files
+            without matches. Defaults to True.
+        partition_columns (list[str], optional): Partition columns added to the merge predicate. With
+            `delete_unmatched=False` this lets delta-rs scan only the partitions present in the changes.
+            With `delete_unmatched=True` every target file is still scanned. Defaults to None.
+        writer_properties (WriterProperties, optional): Parquet writer properties for rewritten files. Defaults to ZSTD level 1 with 1 MiB data pages and chunk-level statistics.
     Raises:
         ValueError: If the id_column is not provided.
         Exception: If there is an error during the upsert operation.
     """
-    # Log the action
-    logger.info(f"Initiating upsert operation on Delta table located at path: '{path}' using '{id_column}' as the unique identifier.")
+    DeltaHandle(path, storage_options).upsert(
+        df_with_changes,
+        id_column,
+        delete_unmatched=delete_unmatched,
+        partition_columns=partition_columns,
+        writer_properties=writer_properties
+    )
 
-    try:
-        # Perform the upsert (merge) operation
-        (
-            df_with_changes
-            .write_delta(
-                path,
-                mode='merge',
-                delta_merge_options={
-                    'predicate': f'source.{id_column} = target.{id_column}',
-                    'source_alias': 'source',
-                    'target_alias': 'target',
-                },
-                storage_options=storage_options
+
+def upsert_delta_table_batch(
+    df_with_changes: pl.DataFrame,
+    path: str,
+    id_column: str,
+    partition_column: str,
+    storage_options: dict = None,
+    delete_unmatched: bool = False,
+    writer_properties: WriterProperties = DEFAULT_WRITER_PROPERTIES
+) -> None:
+    """
+    Upserts changes spanning several partitions into a Delta table with a single merge and commit.
+
+    The merge predicate lists the partitions present in the changes, so with the default
+    `delete_unmatched=False` only their files are scanned and rewritten instead of running
+    one merge per partition.
+
+    Parameters:
+        df_with_changes (pl.DataFrame): Polars DataFrame containing the changes to upsert.
+        path (str): Path of the Delta table in the Delta Lake.
+        id_column (str): The column name used as the unique identifier for the merge operation.
+        partition_column (str): The partition column of the Delta table.
+        storage_options (dict, optional): Storage options (e.g., authentication credentials).
+        delete_unmatched (bool, optional): If True, rows of the touched partitions that are not in the changes
+            are deleted. Other partitions are never modified, but every target file is scanned because
+            the by-source delete disables file pruning. Defaults to False.
+        writer_properties (WriterProperties, optional): Parquet writer properties for rewritten files. Defaults to ZSTD level 1 with 1 MiB data pages and chunk-level statistics.
+    Raises:
+        Exception: If there is an error during the upsert operation.
+    """
+    DeltaHandle(path, storage_options).upsert_batch(
+        df_with_changes,
+        id_column,
+        partition_column,
+        delete_unmatched=delete_unmatched,
+        writer_properties=writer_properties
+    )
+
+
+class DeltaHandle:
+    """
+    Shares one Delta table handle across the operations of a logical unit of work.
+
+    The handle comes from the module cache, so the table is opened once and each operation
+    only lists the commits added since the previous one. The handle is shared with other
+    callers, so every operation first refreshes it with `update_incremental` and always
+    sees the latest version of the table rather than a pinned snapshot.
+
+    Parameters:
+        path (str): Path of the Delta table in the Delta Lake.
+        storage_options (dict, optional): Storage options (e.g., authentication credentials).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        storage_options: dict = None
+    ):
+        self.path = path
+        self.storage_options = storage_options
+
+    @property
+    def table(self) -> DeltaTable:
+        """
+        DeltaTable: The shared Delta table handle, refreshed with any new commits on each access.
+        """
+        return _load_delta_table(self.path, self.storage_options)
+
+    def _with_table(self, operation):
+        """
+        Runs `operation(delta_table)`, reopening the table once if the cached handle turns out stale.
+
+        `update_incremental` cannot notice a table that was dropped and recreated, so
+        the cached handle keeps listing files that no longer exist.
+        """
+        # Resolve the handle first: a table that does not exist is not a stale handle
+        delta_table = self.table
+        try:
+            return operation(delta_table)
+        except _STALE_TABLE_ERRORS as e:
+            logger.warning("Reopening stale Delta table handle for path '%s': %s", self.path, e)
+            _evict_delta_table(self.path, self.storage_options)
+            return operation(self.table)
+
+    def exists(self) -> bool:
+        """
+        Checks if the location contains a Delta table. See `check_if_deltatable`.
+        """
+        logger.info("Checking if a Delta table exists at the specified path: %s", self.path)
+
+        try:
+            # Check if the location is a Delta table
+            is_deltatable = _is_deltatable(self.path, self.storage_options)
+            # Log the result
+            if is_deltatable:
+                logger.info("The path '%s' contains a valid Delta table.", self.path)
+            else:
+                logger.warning("The path '%s' does not contain a Delta table or it does not exist.", self.path)
+            return is_deltatable
+
+        except Exception as e:
+            logger.error("An error occurred while checking if the path '%s' is a Delta table: %s", self.path, e)
+            raise
+
+    def metadata(self) -> dict:
+        """
+        Reads the metadata, schema and version of the Delta table. See `read_deltalake_metadata`.
+        """
+        def read_metadata(dt: DeltaTable) -> dict:
+            version = dt.version()
+            logger.info("Loaded Delta table at version %s", version)
+            return {
+                "metadata": dt.metadata(),
+                "schema": dt.schema().to_pyarrow(),
+                "version": version
+            }
+
+        try:
+            return self._with_table(read_metadata)
+        except Exception as e:
+            logger.error("Error reading Delta table metadata: %s", e)
+            raise
+
+    def read(
+        self,
+        to_polars: bool = False,
+        batch_size: int = 131_072,
+        columns: list[str] | None = None,
+        partitions: list[tuple] | None = None,
+        filters = None,
+        rechunk: bool = False
+    ):
+        """
+        Reads the Delta table into an Arrow Table or a Polars DataFrame. See `read_table_in_deltalake`.
+        """
+        logger.info("Reading Delta table from path: %s", self.path)
+
+        def read_table(dt: DeltaTable):
+            reader = _scan_delta_table(dt, batch_size, columns, partitions, filters)
+
+            # Convert to Polars DataFrame if requested, one batch at a time so
+            # each Arrow batch can be released as soon as Polars has ingested it
+            if to_polars:
+                frames = [pl.from_arrow(batch, rechunk=False) for batch in reader]
+                if frames:
+                    return pl.concat(frames, rechunk=rechunk)
+                return pl.from_arrow(reader.schema.empty_table())
+
+            result = pa.Table.from_batches(reader, schema=reader.schema)
+            if rechunk:
+                result = result.combine_chunks()
+            return result
+
+        try:
+            result = self._with_table(read_table)
+            if to_polars:
+                logger.info("Delta table successfully converted to Polars DataFrame.")
+            else:
+                logger.info("Delta table successfully read as Arrow Table.")
+            return result
+
+        except Exception as e:
+            logger.error("Error reading Delta table from path '%s': %s", self.path, e)
+            raise
+
+    def upsert(
+        self,
+        df_with_changes: pl.DataFrame,
+        id_column: str,
+        delete_unmatched: bool = True,
+        partition_columns: list[str] | None = None,
+        writer_properties: WriterProperties = DEFAULT_WRITER_PROPERTIES
+    ) -> None:
+        """
+        Upserts (merges) changes into the Delta table. See `upsert_delta_table`.
+        """
+        # Log the action
+        logger.info("Initiating upsert operation on Delta table located at path: '%s' using '%s' as the unique identifier.", self.path, id_column)
+
+        try:
+            # Match on the partition columns too so delta-rs can prune partitions
+            predicate = f'source.{id_column} = target.{id_column}' + "".join(
+                f' AND source.{column} = target.{column}' for column in (partition_columns or [])
             )
-            .when_matched_update_all()  # Update matched rows
-            .when_not_matched_insert_all()  # Insert unmatched rows
-            .when_not_matched_by_source_delete()
-            .execute()  # Execute the operation
+
+            # Perform the upsert (merge) operation
+            self._with_table(lambda dt: _merge_changes(
+                dt,
+                df_with_changes,
+                predicate,
+                delete_unmatched=delete_unmatched,
+                writer_properties=writer_properties
+            ))
+            logger.info("Upsert operation successfully completed for the Delta table at path: '%s' using '%s' as the unique identifier.", self.path, id_column)
+
+        except Exception as e:
+            logger.error("Upsert operation failed for Delta table at path '%s' using '%s' as the unique identifier: %s", self.path, id_column, e)
+            raise
+
+    def upsert_batch(
+        self,
+        df_with_changes: pl.DataFrame,
+        id_column: str,
+        partition_column: str,
+        delete_unmatched: bool = False,
+        writer_properties: WriterProperties = DEFAULT_WRITER_PROPERTIES
+    ) -> None:
+        """
+        Upserts changes spanning several partitions with a single merge. See `upsert_delta_table_batch`.
+        """
+        logger.info("Initiating batch upsert operation on Delta table located at path: '%s' using '%s' as the unique identifier.", self.path, id_column)
+
+        try:
+            if df_with_changes.is_empty():
+                logger.info("No changes to upsert for the Delta table at path: '%s'.", self.path)
+                return
+
+            partitions = df_with_changes[partition_column].unique().to_list()
+
+            # Restrict the target to the partitions present in the changes. A null
+            # partition never satisfies IN (...), so it needs its own IS NULL term.
+            partition_terms = []
+            values = [value for value in partitions if value is not None]
+            if values:
+                partition_terms.append(f"target.{partition_column} IN ({', '.join(map(_quote_sql_literal, values))})")
+            if len(values) < len(partitions):
+                partition_terms.append(f"target.{partition_column} IS NULL")
+            partition_predicate = f"({' OR '.join(partition_terms)})"
+            self._with_table(lambda dt: _merge_changes(
+                dt,
+                df_with_changes,
+                f"target.{id_column} = source.{id_column} AND {partition_predicate}",
+                delete_unmatched=delete_unmatched,
+                writer_properties=writer_properties,
+                delete_predicate=partition_predicate
+            ))
+            logger.info("Batch upsert operation successfully completed for %d partition(s) of the Delta table at path: '%s'.", len(partitions), self.path)
+
+        except Exception as e:
+            logger.error("Batch upsert operation failed for Delta table at path '%s' using '%s' as the unique identifier: %s", self.path, id_column, e)
+            raise
+
+
+def open_delta(
+    path: str,
+    storage_options: dict = None
+) -> DeltaHandle:
+    """
+    Opens a handle sharing one Delta table across existence checks, metadata, reads and upserts.
+
+    Each operation on the handle sees the latest version of the table.
+
+    Parameters:
+        path (str): Path of the Delta table in the Delta Lake.
+        storage_options (dict, optional): Storage options (e.g., authentication credentials).
+
+    Returns:
+        DeltaHandle: Handle exposing `exists`, `metadata`, `read`, `upsert` and `upsert_batch`.
+    """
+    return DeltaHandle(path, storage_options)
+
+
+def arrow_to_pickle(
+    table
+) -> tuple[bytes, list[pickle.PickleBuffer]]:
+    """
+    Serializes a table with pickle protocol 5, keeping column buffers out-of-band.
+
+    The returned buffers reference the table memory directly, so they can be
+    handed to a transport (e.g., multiprocessing, Ray, Dask) without copying.
+    The exception is chunks that only cover part of their buffers, such as the results of
+    `head()` or `slice()` and the batches returned by `read_table_in_deltalake`, which
+    share row-group sized buffers. Those chunks are copied first, so only their own rows
+    are sent instead of the full buffers.
+
+    Parameters:
+        table (Union[pa.Table, pl.DataFrame]): The table to serialize, either as an Arrow Table or a Polars DataFrame.
+
+    Returns:
+        tuple[bytes, list[pickle.PickleBuffer]]: The pickled schema/layout and the out-of-band column buffers.
+
+    Raises:
+        ValueError: If the input table is not a supported type.
+    """
+    if isinstance(table, pl.DataFrame):
+        table = table.to_arrow(compat_level=pl.CompatLevel.newest())
+    elif not isinstance(table, pa.Table):
+        raise ValueError("Input table must be an Arrow Table or a Polars DataFrame.")
+
+    buffers = []
+    payload = pickle.dumps(_compact_slices(table), protocol=5, buffer_callback=buffers.append)
+    return payload, buffers
+
+
+def _compact_slices(table: pa.Table) -> pa.Table:
+    """
+    Copies chunks that reference larger buffers into buffers of their own size.
+
+    A slice still references the whole buffers of its parent, which pickle would
+    otherwise ship in full. Chunks that use their buffers entirely are kept as they are.
+    """
+    columns = [
+        pa.chunked_array(
+            [pa.concat_arrays([chunk]) if _is_oversized(chunk) else chunk for chunk in column.chunks],
+            type=column.type
         )
-        logger.info(f"Upsert operation successfully completed for the Delta table at path: '{path}' using '{id_column}' as the unique identifier.")
+        for column in table.columns
+    ]
+    return pa.Table.from_arrays(columns, schema=table.schema)
 
-    except Exception as e:
-        logger.error(f"Upsert operation failed for Delta table at path '{path}' using '{id_column}' as the unique identifier: {str(e)}")
-        raise
+
+def _is_oversized(chunk: pa.Array) -> bool:
+    """
+    Tells whether a chunk references more buffer memory than its rows need.
+    """
+    try:
+        return chunk.get_total_buffer_size() > chunk.nbytes
+    except (pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Byte ranges cannot be extracted for view types (e.g., string_view exported
+        # by Polars), so such chunks are sent as they are
+        return False
+
+
+def pickle_to_arrow(
+    payload: bytes,
+    buffers: list
+) -> pa.Table:
+    """
+    Rebuilds an Arrow Table serialized with `arrow_to_pickle` without copying the column buffers.
+
+    Parameters:
+        payload (bytes): The pickled schema/layout returned by `arrow_to_pickle`.
+        buffers (list): The out-of-band buffers returned by `arrow_to_pickle`.
+
+    Returns:
+        pa.Table: The deserialized Arrow Table.
+    """
+    return pickle.loads(payload, buffers=buffers)
@@ -1,11 +1,31 @@
 import logging
+from functools import lru_cache
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=16)
+def _get_session(
+    access_key: str,
+    secret_key: str,
+    region_name: str
+) -> boto3.Session:
+    """
+    Create a boto3 session once per set of credentials so that clients share
+    its loaded botocore data model and credential resolution.
+    """
+    return boto3.Session(
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region_name
+    )
+
+
 def connect_s3(
     endpoint_url: str,
     access_key: str,
@@ -30,17 +50,20 @@ def connect_s3(
     """
     try:
         logger.info("Initializing S3 client...")
-        s3 = boto3.client(
+        session = _get_session(access_key, secret_key, region_name)
+        s3 = session.client(
             's3',
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key,
             endpoint_url=endpoint_url,
-            region_name=region_name
+            config=Config(
+                retries={'max_attempts': 10, 'mode': 'adaptive'},
+                max_pool_connections=64,
+                s3={'addressing_style': 'path'}
+            )
         )
         logger.info("Successfully connected to S3.")
         return s3
     except (BotoCoreError, ClientError) as e:
-        logger.error(f"Failed to connect to S3: {e}")
+        logger.error("Failed to connect to S3: %s", e)
         raise
 
 
@@ -59,12 +82,84 @@ def ensure_bucket_exists(
         Exception: If there is an error checking or creating the bucket.
     """
     try:
-        buckets = s3_client.list_buckets().get("Buckets", [])
-        if not any(bucket["Name"] == bucket_name for bucket in buckets):
+        try:
+            s3_client.head_bucket(Bucket=bucket_name)
+            logger.info("Bucket '%s' already exists.", bucket_name)
+        except ClientError as e:
+            # A missing bucket is reported as a 404, anything else is a real error
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchBucket"):
+                raise
             s3_client.create_bucket(Bucket=bucket_name)
-            logger.info(f"Bucket '{bucket_name}' created.")
-        else:
-            logger.info(f"Bucket '{bucket_name}' already exists.")
+            logger.info("Bucket '%s' created.", bucket_name)
     except Exception as e:
-        logger.error(f"Failed to check/create bucket: {e}")
+        logger.error("Failed to check/create bucket: %s", e)
         raise
+
+
+def get_transfer_config(
+    multipart_threshold: int = 64 * 1024 * 1024,
+    multipart_chunksize: int = 16 * 1024 * 1024,
+    max_concurrency: int = 16
+) -> TransferConfig:
+    """
+    Build a transfer configuration for multipart, multi-threaded uploads.
+
+    Pass the result as `Config=` to `upload_file`/`upload_fileobj` so large
+    files are split into parts that are uploaded concurrently.
+
+    Args:
+        multipart_threshold (int): File size in bytes above which multipart uploads are used (default is 64 MiB).
+        multipart_chunksize (int): Size in bytes of each uploaded part (default is 16 MiB).
+        max_concurrency (int): Maximum number of threads uploading parts (default is 16).
+
+    Returns:
+        TransferConfig: The boto3 transfer configuration.
+    """
+    return TransferConfig(
+        multipart_threshold=multipart_threshold,
+        multipart_chunksize=multipart_chunksize,
+        max_concurrency=max_concurrency,
+        use_threads=True
+    )
+
+
+def get_delta_storage_options(
+    endpoint_url: str,
+    access_key: str,
+    secret_key: str,
+    region_name="us-east-1",
+    dynamodb_table_name: str | None = None,
+    conditional_put: bool = False
+) -> dict:
+    """
+    Build the `storage_options` expected by deltalake for an S3/MinIO endpoint.
+
+    Args:
+        endpoint_url (str): URL of the S3/MinIO service.
+        access_key (str): Access key ID.
+        secret_key (str): Secret access key.
+        region_name (str): AWS region (default is 'us-east-1').
+        dynamodb_table_name (str, optional): DynamoDB table used as commit lock so concurrent writers
+            do not race on `_delta_log`. Unsafe renames are disabled when it is set.
+        conditional_put (bool): Whether the store supports ETag conditional puts for safe concurrent commits (default is False).
+
+    Returns:
+        dict: Storage options to pass to the Delta table helpers.
+    """
+    storage_options = {
+        "AWS_ENDPOINT_URL": endpoint_url,
+        "AWS_ACCESS_KEY_ID": access_key,
+        "AWS_SECRET_ACCESS_KEY": secret_key,
+        "AWS_REGION": region_name,
+        "AWS_ALLOW_HTTP": "true" if endpoint_url.startswith("http://") else "false",
+        "AWS_S3_ALLOW_UNSAFE_RENAME": "true",
+    }
+    if dynamodb_table_name:
+        storage_options.update({
+            "AWS_S3_LOCKING_PROVIDER": "dynamodb",
+            "DELTA_DYNAMO_TABLE_NAME": dynamodb_table_name,
+            "AWS_S3_ALLOW_UNSAFE_RENAME": "false",
+        })
+    if conditional_put:
+        storage_options["conditional_put"] = "etag"
+    return storage_options
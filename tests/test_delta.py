@@ -0,0 +1,312 @@
+import os
+import shutil
+
+import polars as pl
+import pytest
+import pyarrow as pa
+from deltalake import write_deltalake
+
+from my_utils_delta_table import delta
+from my_utils_delta_table.delta import (
+    arrow_to_pickle,
+    check_if_deltatable,
+    invalidate_deltatable_cache,
+    open_delta,
+    pickle_to_arrow,
+    read_deltalake_metadata,
+    read_table_from_shm,
+    read_table_in_deltalake,
+    read_table_in_deltalake_to_shm,
+    upsert_delta_table,
+    upsert_delta_table_batch,
+    write_table_to_deltalake,
+)
+
+
+def test_write_polars_categorical_and_enum_columns(tmp_path):
+    path = str(tmp_path / "table")
+    df = pl.DataFrame({
+        "id": [1, 2, 3],
+        "category": pl.Series(["a", "b", "a"], dtype=pl.Categorical),
+        "status": pl.Series(["new", "done", "new"], dtype=pl.Enum(["new", "done"])),
+        "tags": pl.Series([["a"], ["b", "a"], []], dtype=pl.List(pl.Categorical)),
+        "pair": pl.Series([["a", "b"], ["b", "a"], ["a", "a"]], dtype=pl.Array(pl.Categorical, 2)),
+        "nested": pl.Series(
+            [{"c": "x"}, {"c": "y"}, {"c": None}],
+            dtype=pl.Struct({"c": pl.Categorical})
+        ),
+        "nested_status": pl.Series(
+            [[{"s": "new"}], [], [{"s": "done"}]],
+            dtype=pl.List(pl.Struct({"s": pl.Enum(["new", "done"])}))
+        ),
+    })
+
+    write_table_to_deltalake(df, path)
+
+    result = read_table_in_deltalake(path, to_polars=True).sort("id")
+    assert result["category"].to_list() == ["a", "b", "a"]
+    assert result["status"].to_list() == ["new", "done", "new"]
+    assert result["tags"].to_list() == [["a"], ["b", "a"], []]
+    assert result["pair"].to_list() == [["a", "b"], ["b", "a"], ["a", "a"]]
+    assert result["nested"].to_list() == [{"c": "x"}, {"c": "y"}, {"c": None}]
+    assert result["nested_status"].to_list() == [[{"s": "new"}], [], [{"s": "done"}]]
+
+
+def test_upsert_polars_categorical_column(tmp_path):
+    path = str(tmp_path / "table")
+    write_table_to_deltalake(
+        pl.DataFrame({"id": [1, 2], "category": pl.Series(["a", "b"], dtype=pl.Categorical)}),
+        path
+    )
+
+    upsert_delta_table(
+        pl.DataFrame({"id": [2, 3], "category": pl.Series(["c", "d"], dtype=pl.Categorical)}),
+        path,
+        "id",
+        delete_unmatched=False
+    )
+
+    result = read_table_in_deltalake(path, to_polars=True).sort("id")
+    assert result["category"].to_list() == ["a", "c", "d"]
+
+
+def test_read_reopens_handle_of_recreated_table(tmp_path):
+    path = str(tmp_path / "table")
+    for version in range(3):
+        write_table_to_deltalake(pl.DataFrame({"id": [version]}), path, mode="append")
+    assert read_table_in_deltalake(path, to_polars=True)["id"].sort().to_list() == [0, 1, 2]
+
+    # Drop and recreate the table without going through this module
+    shutil.rmtree(path)
+    write_deltalake(path, pl.DataFrame({"id": [10, 11]}).to_arrow())
+
+    assert read_table_in_deltalake(path, to_polars=True)["id"].sort().to_list() == [10, 11]
+
+
+def test_invalidate_drops_handles_opened_by_reads(tmp_path):
+    path = str(tmp_path / "table")
+    write_table_to_deltalake(pl.DataFrame({"id": [1]}), path)
+    read_table_in_deltalake(path)
+    assert any(key[0] == path for key in delta._delta_tables)
+
+    invalidate_deltatable_cache(path)
+
+    assert not any(key[0] == path for key in delta._delta_tables)
+
+
+def test_arrow_to_pickle_compacts_sliced_tables():
+    table = pa.table({"id": list(range(100_000)), "name": [str(i) for i in range(100_000)]})
+    sliced = table.slice(10, 5)
+
+    payload, buffers = arrow_to_pickle(sliced)
+
+    assert sum(buffer.raw().nbytes for buffer in buffers) < 1_000
+    assert pickle_to_arrow(payload, buffers).equals(sliced)
+
+
+def _write_partitioned_table(path):
+    write_table_to_deltalake(
+        pl.DataFrame({
+            "id": [1, 2, 3, 4],
+            "part": ["a", "a", "b", None],
+            "v": [10, 20, 30, 40],
+        }),
+        path,
+        partition_by=["part"]
+    )
+
+
+def _read_rows(path):
+    return read_table_in_deltalake(path, to_polars=True).sort("id").select("id", "part", "v").rows()
+
+
+def test_upsert_batch_updates_inserts_and_keeps_other_partitions(tmp_path):
+    path = str(tmp_path / "table")
+    _write_partitioned_table(path)
+
+    upsert_delta_table_batch(
+        pl.DataFrame({"id": [2, 5], "part": ["a", "a"], "v": [21, 50]}),
+        path,
+        "id",
+        "part"
+    )
+
+    assert _read_rows(path) == [
+        (1, "a", 10),
+        (2, "a", 21),
+        (3, "b", 30),
+        (4, None, 40),
+        (5, "a", 50),
+    ]
+
+
+def test_upsert_batch_delete_unmatched_only_touches_changed_partitions(tmp_path):
+    path = str(tmp_path / "table")
+    _write_partitioned_table(path)
+
+    upsert_delta_table_batch(
+        pl.DataFrame({"id": [2], "part": ["a"], "v": [21]}),
+        path,
+        "id",
+        "part",
+        delete_unmatched=True
+    )
+
+    assert _read_rows(path) == [(2, "a", 21), (3, "b", 30), (4, None, 40)]
+
+
+def test_upsert_batch_null_partition_only(tmp_path):
+    path = str(tmp_path / "table")
+    _write_partitioned_table(path)
+
+    upsert_delta_table_batch(
+        pl.DataFrame({"id": [4], "part": [None], "v": [41]}, schema={"id": pl.Int64, "part": pl.String, "v": pl.Int64}),
+        path,
+        "id",
+        "part"
+    )
+
+    assert _read_rows(path) == [(1, "a", 10), (2, "a", 20), (3, "b", 30), (4, None, 41)]
+
+
+def test_upsert_batch_null_partition_mixed_with_others(tmp_path):
+    path = str(tmp_path / "table")
+    _write_partitioned_table(path)
+
+    upsert_delta_table_batch(
+        pl.DataFrame({"id": [3, 4], "part": ["b", None], "v": [31, 41]}),
+        path,
+        "id",
+        "part"
+    )
+
+    assert _read_rows(path) == [(1, "a", 10), (2, "a", 20), (3, "b", 31), (4, None, 41)]
+
+
+def test_upsert_batch_empty_changes_is_a_no_op(tmp_path):
+    path = str(tmp_path / "table")
+    _write_partitioned_table(path)
+
+    upsert_delta_table_batch(
+        pl.DataFrame(schema={"id": pl.Int64, "part": pl.String, "v": pl.Int64}),
+        path,
+        "id",
+        "part"
+    )
+
+    assert read_deltalake_metadata(path)["version"] == 0
+
+
+def test_arrow_to_pickle_polars_input():
+    df = pl.DataFrame({"id": [1, 2, 3], "s": ["a", "b", None]})
+
+    payload, buffers = arrow_to_pickle(df)
+
+    assert pl.from_arrow(pickle_to_arrow(payload, buffers)).equals(df)
+
+
+def test_arrow_to_pickle_sliced_polars_input():
+    df = pl.DataFrame({"id": list(range(100_000)), "s": [str(i) for i in range(100_000)]})
+
+    payload, buffers = arrow_to_pickle(df.slice(10, 5))
+
+    assert pl.from_arrow(pickle_to_arrow(payload, buffers)).equals(df.slice(10, 5))
+
+
+def test_failed_shm_read_keeps_published_stream(tmp_path, monkeypatch):
+    shm_dir = tmp_path / "shm"
+    shm_dir.mkdir()
+    monkeypatch.setattr(delta, "SHM_DIR", str(shm_dir))
+    path = str(tmp_path / "table")
+    write_table_to_deltalake(pl.DataFrame({"id": [1, 2]}), path)
+
+    read_table_in_deltalake_to_shm(path, "stream")
+    with pytest.raises(Exception):
+        read_table_in_deltalake_to_shm(str(tmp_path / "missing"), "stream")
+
+    assert os.listdir(shm_dir) == ["stream"]
+    assert read_table_from_shm("stream")["id"].to_pylist() == [1, 2]
+
+
+def test_missing_table_is_opened_once(tmp_path, monkeypatch):
+    opened = []
+    original_delta_table = delta.DeltaTable
+
+    def counting_delta_table(*args, **kwargs):
+        opened.append(args)
+        return original_delta_table(*args, **kwargs)
+
+    monkeypatch.setattr(delta, "DeltaTable", counting_delta_table)
+
+    with pytest.raises(Exception):
+        read_table_in_deltalake(str(tmp_path / "missing"))
+
+    assert len(opened) == 1
+
+
+def test_handle_reads_latest_version_after_append(tmp_path):
+    path = str(tmp_path / "table")
+    write_table_to_deltalake(pl.DataFrame({"id": [1]}), path)
+    handle = open_delta(path)
+    assert handle.read().num_rows == 1
+
+    write_table_to_deltalake(pl.DataFrame({"id": [2]}), path, mode="append")
+
+    assert handle.read().num_rows == 2
+    assert handle.metadata()["version"] == 1
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(delta.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_missing_table_check_expires_after_ttl(tmp_path, clock):
+    path = str(tmp_path / "table")
+    assert not check_if_deltatable(path)
+
+    # Created outside this module, so the negative entry is only dropped by the TTL
+    write_deltalake(path, pa.table({"id": [1]}))
+    clock[0] += delta.MISSING_DELTATABLE_TTL_SECONDS - 1
+    assert not check_if_deltatable(path)
+
+    clock[0] += 2
+    assert check_if_deltatable(path)
+
+
+def test_write_clears_missing_table_check(tmp_path, clock):
+    path = str(tmp_path / "table")
+    assert not check_if_deltatable(path)
+
+    write_table_to_deltalake(pl.DataFrame({"id": [1]}), path)
+
+    assert check_if_deltatable(path)
+
+
+def test_invalidate_after_external_create(tmp_path, clock):
+    path = str(tmp_path / "table")
+    assert not check_if_deltatable(path)
+    write_deltalake(path, pa.table({"id": [1]}))
+    assert not check_if_deltatable(path)
+
+    invalidate_deltatable_cache(path)
+
+    assert check_if_deltatable(path)
+
+
+def test_existing_table_check_is_cached_and_seeds_handle(tmp_path, clock):
+    path = str(tmp_path / "table")
+    write_deltalake(path, pa.table({"id": [1]}))
+
+    assert check_if_deltatable(path)
+    assert (path, ()) in delta._delta_tables
+
+    # Positive results are kept until the cache is invalidated
+    shutil.rmtree(path)
+    clock[0] += delta.MISSING_DELTATABLE_TTL_SECONDS + 1
+    assert check_if_deltatable(path)
+
+    invalidate_deltatable_cache(path)
+    assert not check_if_deltatable(path)